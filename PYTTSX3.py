@@ -1,36 +1,65 @@
 # ARQUIVO: tts_super_robusto.py
+import functools
 import pyttsx3
 import time
 import threading
 
+# Lock da engine compartilhada: uma fala por vez, qualquer que seja a instância
+_lock_engine = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def obter_engine():
+    """Engine ÚNICA do processo, compartilhada por todas as instâncias"""
+    # pyttsx3.Engine em vez de pyttsx3.init(): o init() devolve a engine já
+    # registrada, e o cache_clear() da recuperação não obteria uma engine nova
+    engine = pyttsx3.Engine()
+    engine.setProperty('rate', 170)  # Velocidade ideal
+    engine.setProperty('volume', 1.0)
+    return engine
+
+@functools.lru_cache(maxsize=1)
+def encontrar_voz_pt():
+    """Encontra a melhor voz em português (enumera as vozes uma única vez)"""
+    try:
+        voices = obter_engine().getProperty('voices')
+        
+        for voice in voices:
+            if any(term in voice.name.lower() for term in ['português', 'brazil', 'portuguese', 'pt-br']):
+                print(f"✅ Voz encontrada: {voice.name}")
+                return voice.id
+        
+        # Fallback para primeira voz disponível
+        if voices:
+            print(f"⚠️  Voz padrão: {voices[0].name}")
+            return voices[0].id
+            
+        return None
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar vozes: {e}")
+        return None
+
 class TTS_Super_Robusto:
     def __init__(self):
         print("🚀 Iniciando TTS Super-Robusto...")
-        self.voice_id = self._encontrar_voz_pt()
+        # ✅ Engine ÚNICA, protegida por lock: sem reinicializar o driver a cada fala
+        self._lock = _lock_engine
+        self.voice_id = None
+        self.engine = self._obter_engine()
         print("🎯 TTS Super-Robusto - PRONTO!")
     
-    def _encontrar_voz_pt(self):
-        """Encontra a melhor voz em português"""
+    def _obter_engine(self, recriar=False):
+        """Obtém a engine compartilhada já com a voz em português"""
         try:
-            engine = pyttsx3.init()
-            voices = engine.getProperty('voices')
-            
-            for voice in voices:
-                if any(term in voice.name.lower() for term in ['português', 'brazil', 'portuguese', 'pt-br']):
-                    print(f"✅ Voz encontrada: {voice.name}")
-                    engine.stop()
-                    return voice.id
-            
-            # Fallback para primeira voz disponível
-            if voices:
-                print(f"⚠️  Voz padrão: {voices[0].name}")
-                engine.stop()
-                return voices[0].id
-                
-            return None
-            
+            if recriar:
+                obter_engine.cache_clear()
+            engine = obter_engine()
+            self.voice_id = encontrar_voz_pt()
+            if self.voice_id:
+                engine.setProperty('voice', self.voice_id)
+            return engine
         except Exception as e:
-            print(f"❌ Erro ao buscar vozes: {e}")
+            print(f"❌ Erro ao iniciar engine: {e}")
             return None
     
     def falar(self, texto):
@@ -41,45 +70,31 @@ class TTS_Super_Robusto:
         print(f"🎤 FALANDO: {texto}")
         
         try:
-            # ✅ CORREÇÃO: NOVA engine para CADA fala
-            engine = pyttsx3.init()
-            
-            # Configurações
-            engine.setProperty('rate', 170)  # Velocidade ideal
-            engine.setProperty('volume', 1.0)
-            
-            if self.voice_id:
-                engine.setProperty('voice', self.voice_id)
-            
-            # Fala o texto
-            engine.say(texto)
-            engine.runAndWait()
-            
-            # Limpeza adequada
-            engine.stop()
-            
-            print("✅ Fala OK!")
-            
-        except RuntimeError as e:
-            if "run loop already started" in str(e):
-                # ✅ CORREÇÃO para o bug específico
-                print("⚠️  Bug do run loop corrigido automaticamente")
-                self._falar_alternativo(texto)
-            else:
-                print(f"❌ Erro Runtime: {e}")
+            # ✅ CORREÇÃO: uma fala por vez na MESMA engine (sem engine.stop())
+            with self._lock:
+                try:
+                    self.engine.say(texto)
+                    self.engine.runAndWait()
+                    print("✅ Fala OK!")
+                except RuntimeError as e:
+                    if "run loop already started" in str(e):
+                        # ✅ CORREÇÃO para o bug específico
+                        print("⚠️  Bug do run loop corrigido automaticamente")
+                        self._falar_alternativo(texto)
+                    else:
+                        print(f"❌ Erro Runtime: {e}")
         except Exception as e:
             print(f"❌ Erro geral: {e}")
             print(f"🔊 [FALLBACK]: {texto}")
     
     def _falar_alternativo(self, texto):
-        """Método alternativo para quando o principal falha"""
+        """Método alternativo: recria a engine quando o loop anterior travou"""
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 170)
-            engine.say(texto)
-            engine.runAndWait()
-            engine.stop()
+            # Solta a engine travada antes de criar a nova
+            self.engine = None
+            self.engine = self._obter_engine(recriar=True)
+            self.engine.say(texto)
+            self.engine.runAndWait()
         except:
             print(f"🔊 [FALLBACK FINAL]: {texto}")
 
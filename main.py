@@ -9,17 +9,41 @@ interagir com o usuário.
 A navegação é feita através do console com uma interface de texto simples.
 """
 
+import functools
 import json
 import speech_recognition as sr
 import os
 import random
 import time
 import platform
+import queue
 import subprocess
 import re
+import sys
+import textwrap
+import threading
 import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturoTimeoutError
+from enum import IntEnum
 from pathlib import Path
 
+# orjson (opcional) faz o parse dos JSONs bem mais rápido que o módulo padrão
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Quebra de frases para o TTS: pontuação final seguida de espaço, o que preserva
+# números como "1.500" e "3,14" inteiros dentro da mesma frase.
+_RE_FIM_FRASE = re.compile(r'(?<=[.!?])\s+')
+
+# Expressões usadas a cada normalização de texto, compiladas uma única vez
+_RE_PONTUACAO = re.compile(r'[^\w\s]')
+_RE_ESPACOS = re.compile(r'\s+')
+
+# Termos que identificam uma voz em português no nome da voz do sistema
+_RE_VOZ_PT = re.compile(r'português|brazil|portuguese|pt-br', re.IGNORECASE)
+
 # =========================
 # CONFIGURAÇÕES GLOBAIS
 # =========================
@@ -38,78 +62,197 @@ class Config:
     # Controla exibição das instruções iniciais (apenas primeira execução)
     PRIMEIRA_EXECUCAO = True
     
+    # Exibe os detalhes de cada busca (palavras-chave, bônus, pontuação).
+    # Desligado por padrão: os prints ficam no caminho quente da busca.
+    DEBUG = False
+    
     
 # =========================
 # TTS COM BLOQUEIO OTIMIZADO
 # =========================
+@functools.lru_cache(maxsize=1)
+def obter_engine_tts():
+    """
+    Retorna a engine pyttsx3 única do processo, com velocidade e volume configurados.
+    
+    Para descartar uma engine travada, chame obter_engine_tts.cache_clear()
+    antes de pedir a próxima. A engine é criada com pyttsx3.Engine e não com
+    pyttsx3.init(), que devolveria a mesma instância travada enquanto alguma
+    referência a ela ainda existisse.
+    """
+    import pyttsx3
+    engine = pyttsx3.Engine()
+    engine.setProperty('rate', 170)
+    engine.setProperty('volume', 1.0)
+    return engine
+
+@functools.lru_cache(maxsize=1)
+def encontrar_voz_pt():
+    """
+    Encontra a melhor voz em português.
+    
+    Enumerar as vozes é caro (no Windows o SAPI5 percorre o registro), então a
+    busca acontece uma única vez por processo e o id fica em cache.
+    """
+    try:
+        voices = obter_engine_tts().getProperty('voices')
+        
+        for voice in voices:
+            if _RE_VOZ_PT.search(voice.name):
+                print(f"✅ Voz: {voice.name}")
+                return voice.id
+        
+        if voices:
+            print(f"⚠️  Voz padrão: {voices[0].name}")
+            return voices[0].id
+            
+        return None
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar vozes: {e}")
+        return None
+
 class GerenciadorTTS:
     def __init__(self):
         print("🔊 Iniciando TTS...")
-        self.voice_id = self._encontrar_voz_pt()
-        self.falando = False
+        # Uma única engine é reaproveitada entre as falas e só a thread de fala
+        # (_processar_fila) a usa, por isso não há lock. A engine é única no
+        # processo, então também deve existir um único GerenciadorTTS: uma segunda
+        # instância usaria a engine a partir de outra thread.
+        self.voice_id = None
+        self.engine = None
         self.ultima_fala_time = 0
+        
+        # As falas são enfileiradas e sintetizadas por uma thread dedicada, assim
+        # falar() retorna imediatamente e a próxima frase pode ser enfileirada
+        # enquanto a atual ainda está sendo reproduzida.
+        self._fila = queue.Queue()
+        # Cada fala é enfileirada com a geração corrente; interromper() avança a
+        # geração e a thread de fala descarta o que pertence a gerações anteriores.
+        self._geracao = 0
+        self._geracao_em_fala = 0  # Geração da fala que a engine está reproduzindo
+        self._pronto = threading.Event()
+        self._worker = threading.Thread(target=self._processar_fila, daemon=True)
+        self._worker.start()
+        self._pronto.wait()
         print("✅ TTS Carregado!")
     
-    def _encontrar_voz_pt(self):
-        """Encontra a melhor voz em português"""
+    @property
+    def falando(self):
+        """True enquanto houver falas na fila ou em reprodução"""
+        return self._fila.unfinished_tasks > 0
+    
+    def _processar_fila(self):
+        """Loop da thread de fala: consome a fila usando sempre a mesma engine"""
+        # No Windows (SAPI5/COM) a engine precisa ser usada na mesma thread que a
+        # criou, por isso ela é obtida aqui e não no __init__.
+        self.engine = self._obter_engine()
+        self._pronto.set()
+        
+        while True:
+            geracao, frases = self._fila.get()
+            try:
+                if geracao == self._geracao:
+                    self._sintetizar(geracao, frases)
+                    self.ultima_fala_time = time.time()
+            finally:
+                self._fila.task_done()
+    
+    def _obter_engine(self, recriar=False):
+        """Obtém a engine compartilhada, já com a voz em português selecionada"""
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            voices = engine.getProperty('voices')
-            
-            for voice in voices:
-                if any(term in voice.name.lower() for term in ['português', 'brazil', 'portuguese', 'pt-br']):
-                    print(f"✅ Voz: {voice.name}")
-                    engine.stop()
-                    return voice.id
-            
-            if voices:
-                print(f"⚠️  Voz padrão: {voices[0].name}")
-                engine.stop()
-                return voices[0].id
-                
-            return None
-            
+            if recriar:
+                obter_engine_tts.cache_clear()
+            engine = obter_engine_tts()
+            self.voice_id = encontrar_voz_pt()
+            if self.voice_id:
+                engine.setProperty('voice', self.voice_id)
+            # É a cada palavra, dentro do runAndWait da thread de fala, que uma
+            # interrupção pedida por outra thread é efetivamente aplicada.
+            engine.connect('started-word', self._ao_iniciar_palavra)
+            return engine
         except Exception as e:
-            print(f"❌ Erro ao buscar vozes: {e}")
+            print(f"❌ Erro ao iniciar TTS: {e}")
             return None
     
     def falar(self, texto):
-        """Sintetiza fala do texto com sistema de bloqueio para evitar sobreposição"""
+        """Enfileira o texto para ser falado pela thread de TTS, sem bloquear"""
         # Ignora textos vazios para evitar chamadas desnecessárias ao TTS
         if not texto or not texto.strip():
             return
             
         print(f"🎤 IA: {texto}")
-        self.falando = True
+        # Cada frase vai para a fila separadamente: a primeira começa a tocar logo
+        # e as seguintes são sintetizadas em sequência, sem esperar o texto inteiro.
+        geracao = self._geracao
+        for frase in _RE_FIM_FRASE.split(texto.strip()):
+            self._fila.put((geracao, (frase,)))
+    
+    def falar_multi(self, frases):
+        """
+        Fala várias frases curtas em sequência numa única chamada à engine.
         
+        As frases são enviadas juntas para a engine e reproduzidas num só loop
+        de execução, sem o custo de iniciar e encerrar o loop entre elas.
+        """
+        frases = tuple(f for f in frases if f and f.strip())
+        if not frases:
+            return
+        
+        for frase in frases:
+            print(f"🎤 IA: {frase}")
+        self._fila.put((self._geracao, frases))
+    
+    def aguardar(self):
+        """Bloqueia até que todas as falas enfileiradas terminem"""
+        self._fila.join()
+    
+    def interromper(self):
+        """Descarta as falas pendentes e interrompe a fala atual"""
+        # As falas já enfileiradas ficam obsoletas e serão puladas pela thread de
+        # fala, inclusive uma que ela tenha acabado de retirar da fila. A fala em
+        # reprodução é parada pela própria thread de fala (_ao_iniciar_palavra):
+        # a engine não pode ser usada a partir desta thread.
+        self._geracao += 1
+    
+    def _ao_iniciar_palavra(self, name, location, length):
+        """Callback da engine (thread de fala): para a fala de uma geração descartada"""
+        if self._geracao_em_fala != self._geracao:
+            self.engine.stop()
+    
+    def falar_interruptivel(self, texto):
+        """
+        Troca o que está sendo falado pelo novo texto.
+        
+        Usado nos anúncios de navegação: ao percorrer uma lista rapidamente, o
+        usuário ouve logo o item atual em vez de esperar a leitura dos anteriores.
+        """
+        self.interromper()
+        self.falar(texto)
+    
+    def _sintetizar(self, geracao, frases):
+        """Fala as frases na engine compartilhada (executado na thread de TTS)"""
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            
-            engine.setProperty('rate', 170)
-            engine.setProperty('volume', 1.0)
-            
-            if self.voice_id:
-                engine.setProperty('voice', self.voice_id)
-            
-            engine.say(texto)
-            engine.runAndWait()
-            engine.stop()
-            
-        except RuntimeError as e:
-            # A biblioteca pyttsx3 pode lançar este erro se uma nova fala for solicitada
-            # antes que o loop de execução anterior tenha sido completamente finalizado.
-            # Chamamos um método alternativo para garantir que a fala não seja perdida.
-            if "run loop already started" in str(e):
-                self._falar_alternativo(texto)
-            else:
-                print(f"❌ Erro Runtime: {e}")
+            try:
+                self._geracao_em_fala = geracao
+                # Não chamamos engine.stop() aqui: a engine continua viva para a próxima fala.
+                for frase in frases:
+                    self.engine.say(frase)
+                # Uma interrupção pode ter chegado enquanto as frases eram preparadas
+                if geracao != self._geracao:
+                    self.engine.stop()
+                    return
+                self.engine.runAndWait()
+            except RuntimeError as e:
+                # A biblioteca pyttsx3 pode lançar este erro se uma nova fala for solicitada
+                # antes que o loop de execução anterior tenha sido completamente finalizado.
+                # Chamamos um método alternativo para garantir que a fala não seja perdida.
+                if "run loop already started" in str(e):
+                    self._falar_alternativo(frases)
+                else:
+                    print(f"❌ Erro Runtime: {e}")
         except Exception as e:
             print(f"❌ Erro ao falar: {e}")
-        finally:
-            self.falando = False
-            self.ultima_fala_time = time.time()
     
     def pode_processar_tecla(self):
         """
@@ -132,17 +275,75 @@ class GerenciadorTTS:
             
         return True
     
-    def _falar_alternativo(self, texto):
-        """Método alternativo"""
+    def _falar_alternativo(self, frases):
+        """Recria a engine quando o loop de execução anterior ficou preso"""
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 170)
-            engine.say(texto)
-            engine.runAndWait()
-            engine.stop()
+            # Solta a engine travada antes de criar a nova
+            self.engine = None
+            self.engine = self._obter_engine(recriar=True)
+            for frase in frases:
+                self.engine.say(frase)
+            self.engine.runAndWait()
         except:
-            print(f"🔊 [FALLBACK]: {texto}")
+            print(f"🔊 [FALLBACK]: {' '.join(frases)}")
+
+# =========================
+# NORMALIZAÇÃO DE TEXTO
+# =========================
+# Palavras irrelevantes para a busca (artigos, preposições, pronomes...)
+STOP_WORDS = frozenset({
+    'a', 'o', 'as', 'os', 'um', 'uma', 'uns', 'umas', 'de', 'do', 'da', 'dos', 'das',
+    'em', 'no', 'na', 'nos', 'nas', 'por', 'para', 'com', 'sem', 'sob', 'sobre',
+    'que', 'qual', 'quem', 'cujo', 'onde', 'como', 'quando', 'e', 'ou', 'mas', 'se',
+    'me', 'te', 'lhe', 'nos', 'vos', 'lhes', 'eu', 'tu', 'ele', 'ela', 'nós', 'vós',
+    'eles', 'elas', 'é', 'são', 'foi', 'era', 'fale', 'sobre', 'diga', 'explique',
+    'oque', 'qualé', 'quemé', 'comoé'  # ✅ Palavras comuns em perguntas
+})
+
+def _criar_tabela_acentos():
+    """Tabela para str.translate: caractere acentuado -> forma sem acento"""
+    tabela = {}
+    for codigo in range(0x80, 0x500):
+        caractere = chr(codigo)
+        decomposto = unicodedata.normalize('NFKD', caractere)
+        sem_acento = ''.join(c for c in decomposto if not unicodedata.combining(c))
+        if sem_acento != caractere:
+            tabela[codigo] = sem_acento
+    return str.maketrans(tabela)
+
+# Cobre o latim acentuado (e grego/cirílico); o restante cai no caminho NFKD
+_TABELA_ACENTOS = _criar_tabela_acentos()
+_RE_FORA_DA_TABELA = re.compile(r'[^\x00-\u04ff]')
+
+# As funções abaixo são puras e chamadas para as mesmas palavras-chave a cada
+# busca, por isso guardam em cache o resultado de cada texto já normalizado.
+@functools.lru_cache(maxsize=100_000)
+def remover_acentos(texto):
+    if not texto:
+        return ""
+    if not _RE_FORA_DA_TABELA.search(texto):
+        return texto.translate(_TABELA_ACENTOS)
+    texto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+@functools.lru_cache(maxsize=100_000)
+def normalizar_texto(texto):
+    if not texto:
+        return ""
+    texto = texto.lower().strip()
+    texto = remover_acentos(texto)
+    texto = _RE_PONTUACAO.sub('', texto)
+    return _RE_ESPACOS.sub(' ', texto).strip()
+
+@functools.lru_cache(maxsize=100_000)
+def extrair_palavras_chave(texto):
+    """Retorna (palavras relevantes, texto normalizado), sem stop words"""
+    if not texto:
+        return frozenset(), ""
+    
+    texto_limpo = normalizar_texto(texto)
+    palavras_relevantes = frozenset(p for p in texto_limpo.split() if p not in STOP_WORDS)
+    return palavras_relevantes, texto_limpo
 
 # =========================
 # MOTOR DE BUSCA INTELIGENTE MELHORADO
@@ -158,116 +359,167 @@ class MotorBusca:
     Attributes:
         pasta_base (Path): Caminho para os arquivos JSON de conhecimento
         estrutura_temas (dict): Mapeamento de temas e subtemas carregados
-        stop_words (set): Conjunto de palavras irrelevantes para busca
+        itens (list): Todos os itens da base como tuplas (tema, subtema, item)
+        indice_invertido (dict): Palavra-chave -> posições em `itens` que a contêm
     """
     def __init__(self, pasta_base: str):
         self.pasta_base = Path(pasta_base)
         self.conversor = ConversorNumeros()
         self.estrutura_temas = self._carregar_estrutura_temas()
+        # Subtemas já carregados, com as palavras-chave pré-processadas por item
+        self._json_cache: dict[tuple[str, str], list] = {}
+        # Gerador próprio para sorteios e sugestões, separado do estado global de `random`
+        self._rng = random.Random()
         
-        self.stop_words = {
-            'a', 'o', 'as', 'os', 'um', 'uma', 'uns', 'umas', 'de', 'do', 'da', 'dos', 'das',
-            'em', 'no', 'na', 'nos', 'nas', 'por', 'para', 'com', 'sem', 'sob', 'sobre',
-            'que', 'qual', 'quem', 'cujo', 'onde', 'como', 'quando', 'e', 'ou', 'mas', 'se',
-            'me', 'te', 'lhe', 'nos', 'vos', 'lhes', 'eu', 'tu', 'ele', 'ela', 'nós', 'vós',
-            'eles', 'elas', 'é', 'são', 'foi', 'era', 'fale', 'sobre', 'diga', 'explique',
-            'oque', 'qualé', 'quemé', 'comoé'  # ✅ Palavras comuns em perguntas
-        }
+        self._construir_indice()
 
     def _carregar_estrutura_temas(self):
         estrutura = {}
-        if not self.pasta_base.exists():
+        # os.scandir já traz nome e tipo de cada entrada na própria listagem do
+        # diretório, sem um stat extra por arquivo como Path.iterdir/glob.
+        try:
+            entradas_temas = os.scandir(self.pasta_base)
+        except FileNotFoundError:
             print(f"❌ Pasta {self.pasta_base} não encontrada!")
             return estrutura
             
-        for tema_path in self.pasta_base.iterdir():
-            if tema_path.is_dir():
-                tema_nome = tema_path.name
-                subtemas = [f.stem for f in tema_path.glob("*.json")]
-                if subtemas:
-                    estrutura[tema_nome] = subtemas
+        with entradas_temas:
+            for tema_entry in entradas_temas:
+                if tema_entry.is_dir():
+                    with os.scandir(tema_entry.path) as arquivos:
+                        subtemas = [a.name[:-len(".json")] for a in arquivos if a.name.endswith(".json")]
+                    if subtemas:
+                        estrutura[tema_entry.name] = subtemas
         
         print(f"✅ Estrutura carregada: {len(estrutura)} temas")
         return estrutura
 
     def carregar_json(self, tema: str, subtema: str):
-        """Carrega JSON com expansão de palavras-chave"""
+        """Carrega JSON com expansão de palavras-chave (resultado fica em cache)"""
+        chave = (tema, subtema)
+        if chave in self._json_cache:
+            return self._json_cache[chave]
+        
         try:
-            caminho = self.pasta_base / tema / f"{subtema}.json"
-            with open(caminho, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
+            caminho = os.path.join(self.pasta_base, tema, f"{subtema}.json")
+            if orjson:
+                with open(caminho, 'rb') as f:
+                    dados = orjson.loads(f.read())
+            else:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
             
             for item in dados:
                 if "palavras_chave" in item:
                     item["palavras_chave"] = self.conversor.expandir_palavras_chave_com_numeros(
                         item["palavras_chave"]
                     )
+                self._preparar_item(item)
             
+            self._json_cache[chave] = dados
             return dados
         except Exception as e:
             print(f"❌ Erro ao carregar {tema}/{subtema}.json: {e}")
             return []
 
-    def _extrair_palavras_chave(self, texto):
-        if not texto:
-            return set(), ""
+    def _preparar_item(self, item):
+        """
+        Pré-calcula no item os dados normalizados usados em toda busca.
+        
+        A normalização (minúsculas, remoção de acentos e pontuação) é a parte
+        mais cara do processamento de texto, então é feita uma única vez aqui,
+        no carregamento, e nunca durante as buscas.
+        """
+        palavras_chave = item.get("palavras_chave", [])
+        palavras_chave_norm = [normalizar_texto(p) for p in palavras_chave]
+        
+        # Conjunto congelado de palavras do item: palavras soltas entram sem stop
+        # words, frases entram com todas as palavras. É consultado a cada busca.
+        item['_kw'] = frozenset(
+            palavra
+            for palavra_chave, normalizada in zip(palavras_chave, palavras_chave_norm)
+            for palavra in normalizada.split()
+            if ' ' in palavra_chave or palavra not in STOP_WORDS
+        )
+        item['_pergunta_norm'] = normalizar_texto(item.get('pergunta', ''))
+
+    def _construir_indice(self):
+        """
+        Indexa toda a base uma única vez, na inicialização.
+        
+        Cada busca passa a pontuar apenas os itens que compartilham alguma
+        palavra com a pergunta, em vez de percorrer todos os itens do tema.
+        As posições são atribuídas na ordem de `estrutura_temas`, o que
+        preserva o desempate da busca sequencial (vence o primeiro item).
+        """
+        self.itens = []
+        self.indice_invertido = {}
+        # Palavras das perguntas, separadas por tema: o bônus da pergunta compara
+        # por substring, então a busca de candidatos precisa varrer esses termos.
+        self._indice_perguntas = {}
+        self._faixa_por_tema = {}
+        
+        # Leitura, parse e normalização de cada subtema são independentes, então os
+        # arquivos são carregados em paralelo; cada thread grava uma chave distinta
+        # do cache. A montagem do índice abaixo continua sequencial e em ordem.
+        pares = [(tema, subtema) for tema, subtemas in self.estrutura_temas.items() for subtema in subtemas]
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            list(executor.map(lambda par: self.carregar_json(*par), pares))
+        
+        for tema, subtemas in self.estrutura_temas.items():
+            inicio_tema = len(self.itens)
+            termos_tema = self._indice_perguntas.setdefault(tema, {})
+            for subtema in subtemas:
+                for item in self.carregar_json(tema, subtema):
+                    posicao = len(self.itens)
+                    self.itens.append((tema, subtema, item))
+                    for palavra in item['_kw']:
+                        self.indice_invertido.setdefault(palavra, []).append(posicao)
+                    for termo in set(item['_pergunta_norm'].split()):
+                        termos_tema.setdefault(termo, []).append(posicao)
+            # Os itens de um tema ocupam posições contíguas em self.itens
+            self._faixa_por_tema[tema] = (inicio_tema, len(self.itens))
+        
+        print(f"✅ Índice criado: {len(self.itens)} perguntas, {len(self.indice_invertido)} palavras")
+
+    def _buscar_candidatos(self, palavras_usuario, tema):
+        """Retorna, em ordem, as posições dos itens do tema que podem pontuar"""
+        candidatos = set()
+        for palavra in palavras_usuario:
+            candidatos.update(self.indice_invertido.get(palavra, ()))
+        
+        # Itens cuja pergunta contém uma palavra do usuário dentro de algum termo
+        # (ex: "planeta" em "planetas") também recebem bônus em _buscar_em_dados.
+        for termo, posicoes in self._indice_perguntas.get(tema, {}).items():
+            for palavra in palavras_usuario:
+                if palavra in termo:
+                    candidatos.update(posicoes)
+                    break
         
-        texto_limpo = self.normalizar_texto(texto)
-        palavras = set(texto_limpo.split())
-        palavras_relevantes = palavras - self.stop_words
+        return sorted(i for i in candidatos if self.itens[i][0] == tema)
+
+    def _extrair_palavras_chave(self, texto):
+        palavras_relevantes, texto_limpo = extrair_palavras_chave(texto)
         
-        print(f"🔍 Palavras-chave: {list(palavras_relevantes)}")
+        if Config.DEBUG:
+            print(f"🔍 Palavras-chave: {list(palavras_relevantes)}")
         return palavras_relevantes, texto_limpo
 
-    def _calcular_pontuacao(self, palavras_usuario, palavras_chave_item, texto_usuario_normalizado):
+    def _calcular_pontuacao(self, palavras_usuario, palavras_chave_item):
         """
         Calcula pontuação de relevância entre pergunta do usuário e item da base.
         
-        Usa múltiplas estratégias:
-        - Contagem de palavras-chave comuns
-        - Bônus por frases similares (permite 1 palavra diferente)
-        - Bônus por ordem correta das palavras
+        A pontuação é o número de palavras-chave em comum. As palavras-chave em
+        forma de frase contribuem com cada uma das suas palavras (ver _preparar_item).
         
         Args:
             palavras_usuario: Palavras-chave da pergunta do usuário
             palavras_chave_item: Palavras-chave do item da base
-            texto_usuario_normalizado: Texto da pergunta normalizado
         
         Returns:
             int: Pontuação total de relevância
         """
-        pontuacao_palavras = len(palavras_usuario.intersection(palavras_chave_item))
-        
-        bonus_frase = 0
-        for palavra_chave in palavras_chave_item:
-            if len(palavra_chave.split()) > 1:
-                # MELHORIA: Busca por partes da frase também
-                palavras_frase = palavra_chave.split()
-                palavras_encontradas = sum(1 for palavra in palavras_frase if palavra in texto_usuario_normalizado)
-                
-                # A correspondência de frase é flexível, permitindo que uma palavra esteja
-                # ausente. Isso ajuda a capturar a intenção mesmo com pequenos erros de
-                # reconhecimento de voz ou o uso de palavras de ligação diferentes (ex: "o que é" vs "o que foi").
-                if palavras_encontradas >= len(palavras_frase) - 1:  # Permite 1 palavra diferente
-                    bonus_frase += 3
-                    print(f"🎯 Frase similar: '{palavra_chave}'")
-        
-        # ✅ MELHORIA: Bônus para ordem das palavras
-        bonus_ordem = 0
-        for palavra_chave in palavras_chave_item:
-            if palavra_chave in texto_usuario_normalizado:
-                # Verifica se as palavras estão na mesma ordem
-                palavras_chave_ordem = palavra_chave.split()
-                if len(palavras_chave_ordem) > 1:
-                    texto_palavras = texto_usuario_normalizado.split()
-                    for i in range(len(texto_palavras) - len(palavras_chave_ordem) + 1):
-                        if texto_palavras[i:i+len(palavras_chave_ordem)] == palavras_chave_ordem:
-                            # O bônus por ordem correta é menor que o de frase, mas ainda significativo.
-                            bonus_ordem += 2
-                            print(f"🔤 Ordem correta: '{palavra_chave}'")
-                            break
-        
-        return pontuacao_palavras + bonus_frase + bonus_ordem
+        return len(palavras_usuario & palavras_chave_item)
 
     def buscar_resposta_inteligente(self, pergunta_usuario, tema_atual=None, subtema_atual=None):
         """
@@ -288,21 +540,23 @@ class MotorBusca:
                 ou (None, None, 0) se não encontrar
         """
         
-        print(f"🔍 Buscando: '{pergunta_usuario}'")
-        # ...
-        print(f"🔍 Buscando: '{pergunta_usuario}'")
+        if Config.DEBUG:
+            print(f"🔍 Buscando: '{pergunta_usuario}'")
         
         palavras_usuario, texto_normalizado = self._extrair_palavras_chave(pergunta_usuario)
         
-        if not palavras_usuario:
+        # Sem tema selecionado não há onde buscar (a busca é restrita ao tema atual)
+        if not palavras_usuario or not tema_atual:
             return None, None, 0
         
         melhor_resposta = None
         melhor_item = None
         maior_pontuacao = 0
         
-        if tema_atual and subtema_atual:
-            dados_subtema = self.carregar_json(tema_atual, subtema_atual)
+        candidatos = [self.itens[i] for i in self._buscar_candidatos(palavras_usuario, tema_atual)]
+        
+        if subtema_atual:
+            dados_subtema = [item for _, subtema, item in candidatos if subtema == subtema_atual]
             if dados_subtema:
                 melhor_resposta, melhor_item, maior_pontuacao = self._buscar_em_dados(
                     palavras_usuario, texto_normalizado, dados_subtema, melhor_resposta, melhor_item, maior_pontuacao
@@ -312,48 +566,26 @@ class MotorBusca:
         # para outros subtemas dentro do mesmo tema. O limiar de 3 foi escolhido
         # para evitar buscas desnecessárias se uma boa correspondência já foi encontrada.
         
-        if tema_atual and (maior_pontuacao < 3):  #REDUZIDO: Busca mais cedo em outros subtemas
-            subtemas = self.estrutura_temas.get(tema_atual, [])
-            for subtema in subtemas:
-                if subtema == subtema_atual:
-                    continue
-                    
-                dados_outro_subtema = self.carregar_json(tema_atual, subtema)
-                if dados_outro_subtema:
-                    resposta_temp, item_temp, pontuacao_temp = self._buscar_em_dados(
-                        palavras_usuario, texto_normalizado, dados_outro_subtema, melhor_resposta, melhor_item, maior_pontuacao
-                    )
-                    
-                    if pontuacao_temp > maior_pontuacao:
-                        melhor_resposta, melhor_item, maior_pontuacao = resposta_temp, item_temp, pontuacao_temp
+        if maior_pontuacao < 3:  #REDUZIDO: Busca mais cedo em outros subtemas
+            dados_outros_subtemas = [item for _, subtema, item in candidatos if subtema != subtema_atual]
+            if dados_outros_subtemas:
+                melhor_resposta, melhor_item, maior_pontuacao = self._buscar_em_dados(
+                    palavras_usuario, texto_normalizado, dados_outros_subtemas, melhor_resposta, melhor_item, maior_pontuacao
+                )
         
         if maior_pontuacao > 0:
-            print(f"🎯 Encontrado (pontuação: {maior_pontuacao})")
+            if Config.DEBUG:
+                print(f"🎯 Encontrado (pontuação: {maior_pontuacao})")
             return melhor_resposta, melhor_item, maior_pontuacao
         else:
             return None, None, 0
 
     def _buscar_em_dados(self, palavras_usuario, texto_normalizado, dados, melhor_resposta, melhor_item, maior_pontuacao):
         for item in dados:
-            palavras_chave_item = set()
-            frases_chave_item = []
-            
-            for palavra_chave in item.get("palavras_chave", []):
-                palavras_normalizadas = self._extrair_palavras_chave(palavra_chave)[0]
-                palavras_chave_item.update(palavras_normalizadas)
-                
-                if ' ' in palavra_chave:
-                    frase_normalizada = self.normalizar_texto(palavra_chave)
-                    frases_chave_item.append(frase_normalizada)
-            
-            palavras_chave_com_frases = palavras_chave_item.copy()
-            for frase in frases_chave_item:
-                palavras_chave_com_frases.update(frase.split())
-            
-            pontuacao = self._calcular_pontuacao(palavras_usuario, palavras_chave_com_frases, texto_normalizado)
+            pontuacao = self._calcular_pontuacao(palavras_usuario, item['_kw'])
             
             # ✅ MELHORIA: Bônus maior para similaridade na pergunta
-            pergunta_item_normalizada = self.normalizar_texto(item.get('pergunta', ''))
+            pergunta_item_normalizada = item['_pergunta_norm']
             if texto_normalizado in pergunta_item_normalizada:
                 pontuacao += 3
             elif any(palavra in pergunta_item_normalizada for palavra in palavras_usuario if len(palavra) > 3):
@@ -368,42 +600,23 @@ class MotorBusca:
 
     def obter_sugestoes_perguntas(self, tema_atual, quantidade=2):
         """✅ MELHORIA: Retorna múltiplas sugestões de perguntas"""
-        sugestoes = []
+        # Sorteia posições direto do índice, sem recarregar nenhum JSON:
+        # primeiro do tema atual e, se não bastar, do restante da base.
+        inicio, fim = self._faixa_por_tema.get(tema_atual, (0, 0))
+        do_tema = range(inicio, fim)
+        posicoes = self._rng.sample(do_tema, min(quantidade, len(do_tema)))
         
-        # Primeiro tenta no tema atual
-        if tema_atual:
-            subtemas = self.estrutura_temas.get(tema_atual, [])
-            for subtema in random.sample(subtemas, min(3, len(subtemas))):
-                dados = self.carregar_json(tema_atual, subtema)
-                if dados and len(dados) > 0:
-                    itens_aleatorios = random.sample(dados, min(quantidade, len(dados)))
-                    for item in itens_aleatorios:
-                        sugestoes.append({
-                            'pergunta': item['pergunta'],
-                            'tema': tema_atual,
-                            'subtema': subtema
-                        })
-                    if len(sugestoes) >= quantidade:
-                        return sugestoes[:quantidade]
-        
-        # Se não encontrou o suficiente, busca em outros temas
-        outros_temas = [tema for tema in self.estrutura_temas.keys() if tema != tema_atual]
-        for tema in random.sample(outros_temas, min(2, len(outros_temas))):
-            subtemas = self.estrutura_temas.get(tema, [])
-            for subtema in random.sample(subtemas, min(2, len(subtemas))):
-                dados = self.carregar_json(tema, subtema)
-                if dados and len(dados) > 0:
-                    itens_aleatorios = random.sample(dados, min(quantidade - len(sugestoes), len(dados)))
-                    for item in itens_aleatorios:
-                        sugestoes.append({
-                            'pergunta': item['pergunta'],
-                            'tema': tema,
-                            'subtema': subtema
-                        })
-                    if len(sugestoes) >= quantidade:
-                        return sugestoes[:quantidade]
-        
-        return sugestoes
+        faltam = quantidade - len(posicoes)
+        if faltam > 0:
+            # Sorteia entre as posições fora da faixa do tema, deslocando as que caem depois dela
+            total_outros = len(self.itens) - len(do_tema)
+            outros = self._rng.sample(range(total_outros), min(faltam, total_outros))
+            posicoes += [i + len(do_tema) if i >= inicio else i for i in outros]
+        
+        return [
+            {'pergunta': item['pergunta'], 'tema': tema, 'subtema': subtema}
+            for tema, subtema, item in (self.itens[i] for i in posicoes)
+        ]
 
     def obter_item_aleatorio_tema(self, tema):
         """Retorna o ITEM completo de um tema"""
@@ -412,10 +625,10 @@ class MotorBusca:
             return None, None
             
         for _ in range(5):
-            subtema = random.choice(subtemas)
+            subtema = self._rng.choice(subtemas)
             dados = self.carregar_json(tema, subtema)
             if dados and len(dados) > 0:
-                item = random.choice(dados)
+                item = self._rng.choice(dados)
                 return item, subtema
                 
         return None, None
@@ -427,34 +640,36 @@ class MotorBusca:
             return None, None, None
             
         for _ in range(10):
-            tema = random.choice(temas)
+            tema = self._rng.choice(temas)
             subtemas = self.estrutura_temas.get(tema, [])
             if subtemas:
-                subtema = random.choice(subtemas)
+                subtema = self._rng.choice(subtemas)
                 dados = self.carregar_json(tema, subtema)
                 if dados and len(dados) > 0:
-                    item = random.choice(dados)
+                    item = self._rng.choice(dados)
                     return item, tema, subtema
                     
         return None, None, None
 
-    def remover_acentos(self, texto):
-        if not texto:
-            return ""
-        texto = unicodedata.normalize('NFKD', texto)
-        return ''.join(c for c in texto if not unicodedata.combining(c))
-
-    def normalizar_texto(self, texto):
-        if not texto:
-            return ""
-        texto = texto.lower().strip()
-        texto = self.remover_acentos(texto)
-        texto = re.sub(r'[^\w\s]', '', texto)
-        return ' '.join(texto.split())
-
 # =========================
 # CONVERSOR DE NÚMEROS
 # =========================
+def _criar_numeros_por_extenso():
+    """Lista com o nome por extenso de cada número de 0 a 100"""
+    unidades = ["zero", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove"]
+    especiais = ["dez", "onze", "doze", "treze", "quatorze", "quinze", "dezesseis", "dezessete", "dezoito", "dezenove"]
+    dezenas = ["", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta", "noventa"]
+
+    numeros = unidades + especiais
+    for numero in range(20, 100):
+        dez, unid = divmod(numero, 10)
+        numeros.append(dezenas[dez] + (" e " + unidades[unid] if unid else ""))
+    numeros.append("cem")
+    return numeros
+
+_NUMEROS_POR_EXTENSO = _criar_numeros_por_extenso()
+_DIGITOS_POR_EXTENSO = dict(zip("0123456789", _NUMEROS_POR_EXTENSO))
+
 class ConversorNumeros:
     @staticmethod
     def numero_para_texto(numero_str: str) -> str:
@@ -464,40 +679,12 @@ class ConversorNumeros:
                 return numero_str
             numero = int(dig)
             if numero <= 100:
-                return ConversorNumeros._converter_pequeno(numero)
+                return _NUMEROS_POR_EXTENSO[numero]
             else:
-                return ' '.join(ConversorNumeros._converter_digitos(ch) for ch in dig if ch.isdigit())
+                return ' '.join(_DIGITOS_POR_EXTENSO.get(ch, ch) for ch in dig if ch.isdigit())
         except Exception:
             return numero_str
 
-    @staticmethod
-    def _converter_pequeno(numero: int) -> str:
-        unidades = ["zero", "um", "dois", "três", "quatro", "cinco", "seis", "sete", "oito", "nove"]
-        especiais = ["dez", "onze", "doze", "treze", "quatorze", "quinze", "dezesseis", "dezessete", "dezoito", "dezenove"]
-        dezenas = ["", "", "vinte", "trinta", "quarenta", "cinquenta", "sessenta", "setenta", "oitenta", "noventa"]
-
-        if numero <= 9:
-            return unidades[numero]
-        elif 10 <= numero <= 19:
-            return especiais[numero - 10]
-        elif numero == 100:
-            return "cem"
-        else:
-            dez = numero // 10
-            unid = numero % 10
-            if unid == 0:
-                return dezenas[dez]
-            else:
-                return dezenas[dez] + " e " + unidades[unid]
-
-    @staticmethod
-    def _converter_digitos(digito: str) -> str:
-        digitos = {
-            '0': 'zero', '1': 'um', '2': 'dois', '3': 'três', '4': 'quatro',
-            '5': 'cinco', '6': 'seis', '7': 'sete', '8': 'oito', '9': 'nove'
-        }
-        return digitos.get(digito, digito)
-
     @staticmethod
     def expandir_palavras_chave_com_numeros(palavras_chave: list) -> list:
         novas = []
@@ -512,16 +699,61 @@ class ConversorNumeros:
                 novas.append(p)
             else:
                 novas.append(p)
-        return list(dict.fromkeys(novas))
+        
+        # Remove duplicatas mantendo a ordem original
+        vistas = set()
+        unicas = []
+        for p in novas:
+            if p not in vistas:
+                vistas.add(p)
+                unicas.append(p)
+        return unicas
 
 # =========================
 # UI SIMPLIFICADA SEM BORDAS
 # =========================
+@functools.lru_cache(maxsize=256)
+def _quebrar_linhas(texto, largura, max_linhas=None):
+    """
+    Quebra o texto em linhas de até `largura` caracteres (resultado em cache).
+    
+    Com `max_linhas`, o textwrap para de montar linhas ao atingir o limite e
+    termina a última com " ..." quando o texto foi cortado.
+    """
+    return tuple(textwrap.wrap(texto, largura, max_lines=max_linhas, placeholder=" ..."))
+
+# Partes fixas das telas, montadas uma única vez
+_SEP = "=" * 40
+_LIMPAR_TELA = "\x1b[2J\x1b[H"  # ANSI: apaga a tela e leva o cursor ao topo
+_BANNER_MENU = "\n".join([
+    _SEP,
+    "      ASSISTENTE EDUCACIONAL IA",
+    _SEP,
+    "W/S - Navegar     ENTER - Selecionar",
+    "4 - Aleatório     3 - Voltar",
+    "R - Repetir áudio",
+    _SEP,
+]) + "\n"
+_CABECALHO_AGUARDE = "\n".join([_SEP, "          AGUARDE...", _SEP]) + "\n"
+_RODAPE_AGUARDE = "O sistema está processando...\n" + _SEP + "\n"
+
+class EstadoUI(IntEnum):
+    """Estados de navegação da interface"""
+    MENU_PRINCIPAL = 0
+    ESCOLHENDO_TEMA = 1
+    ESCOLHENDO_SUBTEMA = 2
+    MODO_PERGUNTAS = 3
+    SUBMENU_REPETIR = 4
+
 class GerenciadorUI:
     def __init__(self, estrutura_temas):
-        self.estado = "menu_principal"
+        self.estado = EstadoUI.MENU_PRINCIPAL
         self.estrutura_temas = estrutura_temas
         self.temas_lista = list(estrutura_temas.keys())
+        # Linhas das listas já formatadas sem marcador; só a selecionada é montada a cada tela
+        self._linhas_temas = [f"    {tema}" for tema in self.temas_lista]
+        self._linhas_subtemas = []
+        self._linhas_subtemas_tema = None  # Tema a que _linhas_subtemas pertence
         self.tema_selecionado_idx = 0
         self.subtema_selecionado_idx = 0
         self.tema_atual = None
@@ -533,147 +765,232 @@ class GerenciadorUI:
         ]
         self.submenu_repetir_idx = 0
         self.estado_anterior = None  # Para voltar ao estado anterior
+        
+        # Tela que representa cada estado de navegação
+        self._telas_por_estado = {
+            EstadoUI.MENU_PRINCIPAL: self.mostrar_menu_principal,
+            EstadoUI.ESCOLHENDO_TEMA: self.mostrar_temas,
+            EstadoUI.ESCOLHENDO_SUBTEMA: self.mostrar_subtemas,
+            EstadoUI.MODO_PERGUNTAS: self.mostrar_modo_perguntas,
+        }
+        
+        # Linhas atualmente na tela, desenhadas por _renderizar (None = tela desconhecida)
+        self._ultimo_quadro = None
+        # Identifica a tela de navegação desenhada por último; se a próxima for
+        # idêntica (mesma tela, seleção e tema), o redesenho é pulado.
+        self._ultima_chave_quadro = None
+        if os.name == 'nt':
+            # Ativa o processamento de sequências ANSI no console do Windows
+            os.system('')
+
+    def _limpar_tela(self):
+        """
+        Limpa a tela inteira; o próximo _renderizar redesenha tudo.
+        
+        Usa a sequência ANSI em vez de os.system('cls'/'clear'), que abria um
+        shell a cada tela. Sem flush aqui: a limpeza sai junto com a escrita
+        da tela seguinte.
+        """
+        self._ultimo_quadro = None
+        self._ultima_chave_quadro = None
+        sys.stdout.write(_LIMPAR_TELA)
+
+    def _renderizar(self, linhas):
+        """
+        Desenha a tela sobrescrevendo o quadro anterior, sem limpar a tela.
+        
+        No primeiro quadro (ou depois de uma limpeza completa) apaga a tela; nos
+        seguintes, volta o cursor ao topo e reescreve todas as linhas por cima.
+        O quadro inteiro é reescrito, não só as linhas alteradas, porque as
+        mensagens de log impressas entre dois quadros podem ter rolado o console,
+        e as linhas antigas já não estariam na mesma posição.
+        """
+        inicio = _LIMPAR_TELA if self._ultimo_quadro is None else "\x1b[H"
+        corpo = "\n".join(f"\x1b[2K{linha}" for linha in linhas)
+        # Apaga o que sobrou abaixo do quadro: linhas antigas e mensagens de log
+        sys.stdout.write(f"{inicio}{corpo}\n\x1b[J")
+        sys.stdout.flush()
+        self._ultimo_quadro = linhas
+
+    def _chave_quadro(self, tela):
+        """Chave da tela de navegação `tela` com a seleção atual, comparada com _ultima_chave_quadro"""
+        return (
+            tela,
+            self.tema_selecionado_idx,
+            self.subtema_selecionado_idx,
+            self.submenu_repetir_idx,
+            self.tema_atual,
+            self.subtema_atual,
+        )
+
+    def invalidar_quadro(self):
+        """Força o próximo mostrar_* a redesenhar (ex.: após mensagens impressas sobre a tela)"""
+        self._ultima_chave_quadro = None
+
+    def _escrever(self, linhas):
+        """Escreve as linhas da tela de uma vez só (um write e um flush)"""
+        sys.stdout.write("\n".join(linhas) + "\n")
+        sys.stdout.flush()
 
     def mostrar_menu_principal(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print("      ASSISTENTE EDUCACIONAL IA")
-        print("=" * 40)
-        print("W/S - Navegar     ENTER - Selecionar")
-        print("4 - Aleatório     3 - Voltar")
-        print("R - Repetir áudio")
-        print("=" * 40)
+        chave = self._chave_quadro(EstadoUI.MENU_PRINCIPAL)
+        if chave == self._ultima_chave_quadro:
+            return
+        self._limpar_tela()
+        sys.stdout.write(_BANNER_MENU)
+        sys.stdout.flush()
+        self._ultima_chave_quadro = chave
 
     def mostrar_temas(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print("         SELECIONE UM TEMA")
-        print("=" * 40)
-        for i, tema in enumerate(self.temas_lista):
-            marcador = ">>>" if i == self.tema_selecionado_idx else "   "
-            print(f"{marcador} {tema}")
-        print("=" * 40)
-        print("W/S - Navegar  ENTER - Selecionar")
+        chave = self._chave_quadro(EstadoUI.ESCOLHENDO_TEMA)
+        if chave == self._ultima_chave_quadro:
+            return
+        linhas = [
+            _SEP,
+            "         SELECIONE UM TEMA",
+            _SEP,
+        ]
+        linhas.extend(self._linhas_temas)
+        if self.temas_lista:
+            linhas[3 + self.tema_selecionado_idx] = ">>> " + self.temas_lista[self.tema_selecionado_idx]
+        linhas.append(_SEP)
+        linhas.append("W/S - Navegar  ENTER - Selecionar")
+        self._renderizar(linhas)
+        self._ultima_chave_quadro = chave
 
     def mostrar_subtemas(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
         if not self.tema_atual:
+            self._limpar_tela()
+            sys.stdout.flush()
+            return
+        
+        chave = self._chave_quadro(EstadoUI.ESCOLHENDO_SUBTEMA)
+        if chave == self._ultima_chave_quadro:
             return
-            
         subtemas = self.estrutura_temas.get(self.tema_atual, [])
-        print("=" * 40)
-        print(f"TEMA: {self.tema_atual}")
-        print("=" * 40)
-        for i, subtema in enumerate(subtemas):
-            marcador = ">>>" if i == self.subtema_selecionado_idx else "   "
-            print(f"{marcador} {subtema}")
-        print("=" * 40)
-        print("W/S - Navegar  ENTER - Selecionar")
+        linhas = [
+            _SEP,
+            f"TEMA: {self.tema_atual}",
+            _SEP,
+        ]
+        if self._linhas_subtemas_tema != self.tema_atual:
+            self._linhas_subtemas = [f"    {subtema}" for subtema in subtemas]
+            self._linhas_subtemas_tema = self.tema_atual
+        linhas.extend(self._linhas_subtemas)
+        if subtemas:
+            linhas[3 + self.subtema_selecionado_idx] = ">>> " + subtemas[self.subtema_selecionado_idx]
+        linhas.append(_SEP)
+        linhas.append("W/S - Navegar  ENTER - Selecionar")
+        self._renderizar(linhas)
+        self._ultima_chave_quadro = chave
 
     def mostrar_modo_perguntas(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print(f"PERGUNTAS: {self.tema_atual}")
-        print(f"SUBTEMA: {self.subtema_atual}")
-        print("=" * 40)
-        print("ENTER - Fazer pergunta com voz")
-        print("4 - Pergunta aleatória")
-        print("3 - Voltar ao menu anterior")
-        print("R - Repetir último áudio")
-        print("=" * 40)
+        chave = self._chave_quadro(EstadoUI.MODO_PERGUNTAS)
+        if chave == self._ultima_chave_quadro:
+            return
+        self._limpar_tela()
+        self._escrever([
+            _SEP,
+            f"PERGUNTAS: {self.tema_atual}",
+            f"SUBTEMA: {self.subtema_atual}",
+            _SEP,
+            "ENTER - Fazer pergunta com voz",
+            "4 - Pergunta aleatória",
+            "3 - Voltar ao menu anterior",
+            "R - Repetir último áudio",
+            _SEP,
+        ])
+        self._ultima_chave_quadro = chave
 
     def mostrar_confirmacao(self, pergunta):
         """Mostra tela de confirmação"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print("      CONFIRMAÇÃO DE PERGUNTA")
-        print("=" * 40)
-        print("Pergunta capturada:")
-        linhas = [pergunta[i:i+38] for i in range(0, len(pergunta), 38)]
-        for linha in linhas[:3]:
-            print(linha)
-        if len(linhas) > 3:
-            print("...")
-        print("=" * 40)
-        print("ENTER - Sim     3 - Não")
+        self._limpar_tela()
+        buf = [
+            _SEP,
+            "      CONFIRMAÇÃO DE PERGUNTA",
+            _SEP,
+            "Pergunta capturada:",
+        ]
+        buf.extend(_quebrar_linhas(pergunta, 38, 3))
+        buf.append(_SEP)
+        buf.append("ENTER - Sim     3 - Não")
+        self._escrever(buf)
 
     def mostrar_resposta_encontrada(self, pergunta_relacionada, pontuacao, pergunta_original):
         """Mostra tela de resposta encontrada"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
+        self._limpar_tela()
+        buf = [_SEP]
         
         # ✅ MOSTRA A QUALIDADE DA CORRESPONDÊNCIA
         if pontuacao >= 5:
-            print("  CORRESPONDÊNCIA EXCELENTE")
+            buf.append("  CORRESPONDÊNCIA EXCELENTE")
         elif pontuacao >= 3:
-            print("    CORRESPONDÊNCIA BOA")
+            buf.append("    CORRESPONDÊNCIA BOA")
         elif pontuacao >= 1:
-            print(" CORRESPONDÊNCIA MÍNIMA")
+            buf.append(" CORRESPONDÊNCIA MÍNIMA")
         else:
-            print(" CORRESPONDÊNCIA ENCONTRADA")
+            buf.append(" CORRESPONDÊNCIA ENCONTRADA")
             
-        print("=" * 40)
-        print("Sua pergunta:")
-        linhas_original = [pergunta_original[i:i+38] for i in range(0, len(pergunta_original), 38)]
-        for linha in linhas_original[:1]:
-            print(linha)
-        print("---")
-        print("Pergunta relacionada:")
-        linhas = [pergunta_relacionada[i:i+38] for i in range(0, len(pergunta_relacionada), 38)]
-        for linha in linhas[:2]:
-            print(linha)
-        if len(linhas) > 2:
-            print("...")
-        print("=" * 40)
-        print("ENTER - Ouvir resposta  3 - Pular")
+        buf.append(_SEP)
+        buf.append("Sua pergunta:")
+        buf.extend(_quebrar_linhas(pergunta_original, 38, 1))
+        buf.append("---")
+        buf.append("Pergunta relacionada:")
+        buf.extend(_quebrar_linhas(pergunta_relacionada, 38, 2))
+        buf.append(_SEP)
+        buf.append("ENTER - Ouvir resposta  3 - Pular")
+        self._escrever(buf)
 
     def mostrar_sugestoes(self, sugestoes):
         """✅ NOVO: Mostra múltiplas sugestões"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print("    SUGESTÕES DE PERGUNTAS")
-        print("=" * 40)
+        self._limpar_tela()
+        buf = [
+            _SEP,
+            "    SUGESTÕES DE PERGUNTAS",
+            _SEP,
+        ]
         
         for i, sugestao in enumerate(sugestoes, 1):
-            print(f"SUGESTÃO {i}:")
-            print(f"Tema: {sugestao['tema']}")
-            print(f"Subtema: {sugestao['subtema']}")
-            linhas = [sugestao['pergunta'][i:i+36] for i in range(0, len(sugestao['pergunta']), 36)]
-            for linha in linhas[:2]:
-                print(linha)
+            buf.append(f"SUGESTÃO {i}:")
+            buf.append(f"Tema: {sugestao['tema']}")
+            buf.append(f"Subtema: {sugestao['subtema']}")
+            buf.extend(_quebrar_linhas(sugestao['pergunta'], 36, 2))
             if i < len(sugestoes):
-                print("-" * 40)
+                buf.append("-" * 40)
         
-        print("=" * 40)
-        print("Pressione qualquer tecla para continuar")
+        buf.append(_SEP)
+        buf.append("Pressione qualquer tecla para continuar")
+        self._escrever(buf)
 
     def mostrar_aguardando(self, mensagem):
         """Mostra tela de aguardando"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print("          AGUARDE...")
-        print("=" * 40)
-        print(mensagem)
-        print("O sistema está processando...")
-        print("=" * 40)
+        self._limpar_tela()
+        sys.stdout.write(_CABECALHO_AGUARDE + mensagem + "\n" + _RODAPE_AGUARDE)
+        sys.stdout.flush()
 
     # ✅ NOVO: Submenu para repetir áudio
     def mostrar_submenu_repetir(self):
         """Mostra o submenu de repetir áudio"""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=" * 40)
-        print("       SUBMENU REPETIR ÁUDIO")
-        print("=" * 40)
+        chave = self._chave_quadro(EstadoUI.SUBMENU_REPETIR)
+        if chave == self._ultima_chave_quadro:
+            return
+        linhas = [
+            _SEP,
+            "       SUBMENU REPETIR ÁUDIO",
+            _SEP,
+        ]
         for i, opcao in enumerate(self.submenu_repetir_opcoes):
             marcador = ">>>" if i == self.submenu_repetir_idx else "   "
-            print(f"{marcador} {opcao}")
-        print("=" * 40)
-        print("W/S - Navegar  ENTER - Selecionar  3 - Voltar")
+            linhas.append(f"{marcador} {opcao}")
+        linhas.append(_SEP)
+        linhas.append("W/S - Navegar  ENTER - Selecionar  3 - Voltar")
+        self._renderizar(linhas)
+        self._ultima_chave_quadro = chave
 
     def entrar_submenu_repetir(self):
         """Entra no submenu de repetir áudio"""
         self.estado_anterior = self.estado
-        self.estado = "submenu_repetir"
+        self.estado = EstadoUI.SUBMENU_REPETIR
         self.submenu_repetir_idx = 0
         self.mostrar_submenu_repetir()
 
@@ -683,14 +1000,13 @@ class GerenciadorUI:
         self.estado_anterior = None
         
         # Atualiza a tela conforme o estado anterior
-        if self.estado == "menu_principal":
-            self.mostrar_menu_principal()
-        elif self.estado == "escolhendo_tema":
-            self.mostrar_temas()
-        elif self.estado == "escolhendo_subtema":
-            self.mostrar_subtemas()
-        elif self.estado == "modo_perguntas":
-            self.mostrar_modo_perguntas()
+        self.mostrar_estado_atual()
+
+    def mostrar_estado_atual(self):
+        """Desenha a tela correspondente ao estado de navegação atual"""
+        mostrar = self._telas_por_estado.get(self.estado)
+        if mostrar:
+            mostrar()
 
     def navegar_submenu_repetir_cima(self):
         """Navega para cima no submenu"""
@@ -710,12 +1026,26 @@ class GerenciadorUI:
 # CONTROLE POR TECLADO SUPER OTIMIZADO
 # =========================
 class ControladorTeclado:
+    _TECLAS_NAVEGACAO = frozenset({'w', 's'})
+
     def __init__(self):
         self.keyboard = None
-        self.ultima_tecla_time = 0
-        # Delay para evitar que um único pressionamento de tecla seja registrado várias vezes.
-        # 0.3 segundos é um valor que funciona bem para a maioria dos teclados mecânicos e de membrana.
-        self.debounce_delay = 0.3
+        self.app = None
+        self._comandos = {}
+        self._comandos_submenu = {}
+        # Momento do último pressionamento aceito de cada tecla. O debounce é por
+        # tecla: só descarta repetições da mesma tecla dentro de debounce_delay,
+        # o suficiente para filtrar o ruído do contato sem perder teclas rápidas.
+        self._ultimo_pressionamento = {}
+        self.debounce_delay = 0.01
+        
+        # O gancho do teclado só enfileira a tecla e retorna; os comandos (fala,
+        # redesenho da tela, reconhecimento de voz) rodam na thread consumidora,
+        # sem atrasar a captura das teclas seguintes. Com a fila cheia, a tecla é descartada.
+        self.fila = queue.Queue(maxsize=16)
+        self._fim_ultimo_comando = 0
+        self._consumidor = threading.Thread(target=self._consumir_teclas, daemon=True)
+        self._consumidor.start()
         
         try:
             import keyboard
@@ -729,60 +1059,92 @@ class ControladorTeclado:
             return
             
         try:
+            self.app = app
+            # Comandos de cada tecla, consultados pela thread consumidora
+            self._comandos = {
+                'w': app.botao_cima,
+                's': app.botao_baixo,
+                'enter': app.botao_selecionar,
+                '4': app.botao_aleatorio,
+                '3': app.botao_voltar,
+                'r': app.botao_repetir_audio,  # Agora abre submenu
+            }
+            # ✅ NOVO: Controle do submenu de repetir
+            self._comandos_submenu = {
+                'w': app.ui.navegar_submenu_repetir_cima,
+                's': app.ui.navegar_submenu_repetir_baixo,
+                'enter': app.botao_selecionar_submenu_repetir,
+                '3': app.ui.sair_submenu_repetir,
+            }
+            
+            # Um atalho por tecla: as demais teclas nem chegam ao código Python
             self.keyboard.unhook_all()
-            self.keyboard.on_press(lambda e: self._processar_tecla(e, app))
+            for tecla in self._comandos:
+                self.keyboard.add_hotkey(tecla, self._processar_tecla, args=(tecla,))
             print("✅ Teclas mapeadas: W, S, ENTER, 4, 3, R")
         except Exception as e:
             print(f"❌ Erro ao configurar teclado: {e}")
 
-    def _processar_tecla(self, evento, app):
+    def _processar_tecla(self, tecla):
+        """Atalho do teclado: aplica o debounce e enfileira a tecla"""
         try:
-            if evento.event_type == "down":
-                current_time = time.time()
-                
-                # ✅ DEBOUNCE
-                if current_time - self.ultima_tecla_time < self.debounce_delay:
-                    return
-                
-                # ✅ BLOQUEIO OTIMIZADO - Usa o método do TTS
-                if not app.tts.pode_processar_tecla():
-                    print("⏳ Aguarde... Sistema ocupado")
-                    return
-                
-                self.ultima_tecla_time = current_time
-                
-                # ✅ NOVO: Controle do submenu de repetir
-                if app.ui.estado == "submenu_repetir":
-                    if evento.name == 'w':
-                        app.ui.navegar_submenu_repetir_cima()
-                    elif evento.name == 's':
-                        app.ui.navegar_submenu_repetir_baixo()
-                    elif evento.name == 'enter':
-                        app.botao_selecionar_submenu_repetir()
-                    elif evento.name == '3':
-                        app.ui.sair_submenu_repetir()
-                else:
-                    # Controles normais
-                    if evento.name == 'w':
-                        app.botao_cima()
-                    elif evento.name == 's':
-                        app.botao_baixo()
-                    elif evento.name == 'enter':
-                        app.botao_selecionar()
-                    elif evento.name == '4':
-                        app.botao_aleatorio()
-                    elif evento.name == '3':
-                        app.botao_voltar()
-                    elif evento.name == 'r':
-                        app.botao_repetir_audio()  # Agora abre submenu
-                    
+            current_time = time.time()
+            
+            # ✅ DEBOUNCE POR TECLA
+            if current_time - self._ultimo_pressionamento.get(tecla, 0) < self.debounce_delay:
+                return
+            
+            self._ultimo_pressionamento[tecla] = current_time
+            self.fila.put_nowait((tecla, current_time))
+            
+        except queue.Full:
+            pass
         except Exception as e:
             print(f"❌ Erro ao processar tecla: {e}")
 
+    def _consumir_teclas(self):
+        """Thread consumidora: executa em ordem os comandos das teclas enfileiradas"""
+        while True:
+            tecla, momento = self.fila.get()
+            try:
+                self._executar_tecla(tecla, momento)
+            except Exception as e:
+                print(f"❌ Erro ao processar tecla: {e}")
+            finally:
+                self._fim_ultimo_comando = time.time()
+
+    def _executar_tecla(self, tecla, momento):
+        app = self.app
+        
+        # Teclas pressionadas enquanto o comando anterior ainda executava (por
+        # exemplo, o ENTER de uma confirmação) não disparam um novo comando.
+        if momento < self._fim_ultimo_comando:
+            return
+        
+        # ✅ BLOQUEIO OTIMIZADO - Usa o método do TTS
+        # W/S só navegam e interrompem a fala anterior, então não esperam o TTS
+        if tecla not in self._TECLAS_NAVEGACAO and not app.tts.pode_processar_tecla():
+            print("⏳ Aguarde... Sistema ocupado")
+            return
+        
+        if app.ui.estado == EstadoUI.SUBMENU_REPETIR:
+            comando = self._comandos_submenu.get(tecla)
+        else:
+            comando = self._comandos.get(tecla)
+        if comando:
+            comando()
+
 # =========================
 # SISTEMA IA PRINCIPAL - MELHORADO
 # =========================
 class SistemaIA:
+    # Tecla 3: estado de destino e anúncio ao voltar de cada estado
+    _VOLTAR = {
+        EstadoUI.ESCOLHENDO_TEMA: (EstadoUI.MENU_PRINCIPAL, "Menu principal"),
+        EstadoUI.ESCOLHENDO_SUBTEMA: (EstadoUI.ESCOLHENDO_TEMA, "Escolhendo tema"),
+        EstadoUI.MODO_PERGUNTAS: (EstadoUI.ESCOLHENDO_SUBTEMA, "Escolhendo subtema"),
+    }
+
     def __init__(self):
         print("🚀 Iniciando Assistente Educacional SUPREMO")
         
@@ -790,37 +1152,104 @@ class SistemaIA:
         self.motor_busca = MotorBusca(Config.PASTA_JSONS)
         self.ui = GerenciadorUI(self.motor_busca.estrutura_temas)
         self.reconhecedor = sr.Recognizer()
+        self.reconhecedor.dynamic_energy_threshold = True
+        # Sem prazo, uma requisição de reconhecimento travada esperaria para sempre
+        self.reconhecedor.operation_timeout = 10
+        self._timeouts_seguidos = 0
+        self._calibrar_microfone()
+        self._rng = random.Random()  # Gerador próprio para os modos aleatórios
         self.controlador = ControladorTeclado()
         
         self.dados_atuais = None
-        self.executando = True
+        self._parar = threading.Event()  # Sinaliza o encerramento para a thread principal
         self.ultima_pergunta = None
         self.ultimo_audio = None
+        self.ultimo_audio_texto = None  # Transcrição de ultimo_audio, evita reenviar à API
         self.ultima_resposta = None  # ✅ NOVO: Guarda a última resposta dada
         
+        # Modo aleatório de cada estado de navegação (tecla 4)
+        self._aleatorio_por_estado = {
+            EstadoUI.MENU_PRINCIPAL: self.aleatorio_global,
+            EstadoUI.ESCOLHENDO_TEMA: self.aleatorio_tema,
+            EstadoUI.ESCOLHENDO_SUBTEMA: self.aleatorio_subtema_na_lista,
+            EstadoUI.MODO_PERGUNTAS: self.aleatorio_subtema,
+        }
+        
         self.controlador.registrar_callbacks(self)
 
+    def _calibrar_microfone(self):
+        """Mede o ruído ambiente uma única vez, na inicialização, para o limiar do microfone"""
+        try:
+            with sr.Microphone() as fonte:
+                self.reconhecedor.adjust_for_ambient_noise(fonte, duration=1.0)
+            print(f"🎙️  Microfone calibrado (limiar: {self.reconhecedor.energy_threshold:.0f})")
+        except Exception as e:
+            print(f"⚠️  Não foi possível calibrar o microfone: {e}")
+
+    def _reconhecer(self, audio):
+        """
+        Transcreve o áudio pela API do Google, permitindo cancelar com a tecla 3.
+        
+        Cada chamada de rede roda na sua própria thread daemon; enquanto ela não
+        termina, a tecla 3 é consultada a cada 20 ms. Uma requisição cancelada
+        segue até o fim (ou até operation_timeout) sem atrasar a próxima nem o
+        encerramento do programa. Retorna None se o usuário cancelou; erros do
+        reconhecimento são repassados a quem chamou.
+        """
+        futuro = Future()
+        
+        def reconhecer():
+            try:
+                futuro.set_result(self.reconhecedor.recognize_google(audio, language='pt-BR'))
+            except Exception as e:
+                futuro.set_exception(e)
+        
+        threading.Thread(target=reconhecer, daemon=True).start()
+        keyboard = self.controlador.keyboard
+        while True:
+            try:
+                return futuro.result(timeout=0.02)
+            except FuturoTimeoutError:
+                if keyboard and keyboard.is_pressed('3'):
+                    # A requisição em andamento não pode ser abortada; o resultado é descartado
+                    print("🚫 Reconhecimento cancelado")
+                    return None
+
     def escutar(self):
         """Escuta o microfone"""
+        # Uma nova gravação invalida o áudio anterior e sua transcrição
+        self.ultimo_audio = None
+        self.ultimo_audio_texto = None
+        
         try:
             with sr.Microphone() as fonte:
                 self.ui.mostrar_aguardando("Escutando... Fale agora")
                 print("🎤 Escutando... FALE AGORA")
-                self.reconhecedor.adjust_for_ambient_noise(fonte, duration=0.5)
+                # Vários tempos esgotados seguidos sugerem que o limiar calibrado na
+                # inicialização ficou alto demais para o ambiente atual: recalibra.
+                if self._timeouts_seguidos >= 2:
+                    self.reconhecedor.adjust_for_ambient_noise(fonte, duration=0.5)
+                    self._timeouts_seguidos = 0
                 audio = self.reconhecedor.listen(fonte, timeout=8, phrase_time_limit=6)
             
+            self._timeouts_seguidos = 0
             self.ultimo_audio = audio
             
             self.ui.mostrar_aguardando("Processando audio...")
-            print("🧠 Processando...")
-            texto = self.reconhecedor.recognize_google(audio, language='pt-BR')
+            print("🧠 Processando... (3 para cancelar)")
+            texto = self._reconhecer(audio)
+            if texto is None:
+                self.tts.falar("Reconhecimento cancelado")
+                return ""
             print(f"👤 Você: {texto}")
             
+            self.ultimo_audio_texto = texto
             self.ultima_pergunta = texto
             return texto.lower()
             
         except sr.WaitTimeoutError:
             print("⏰ Tempo esgotado")
+            self._timeouts_seguidos += 1
             self.tts.falar("Não ouvi nada")
             return ""
         except sr.UnknownValueError:
@@ -834,8 +1263,10 @@ class SistemaIA:
 
     def botao_microfone(self):
         """Sistema de busca completo"""
-        if self.ui.estado == "modo_perguntas":
+        if self.ui.estado == EstadoUI.MODO_PERGUNTAS:
             self.tts.falar("Fale sua pergunta")
+            # Espera o aviso terminar para o microfone não capturar a própria fala
+            self.tts.aguardar()
             pergunta = self.escutar()
             
             if pergunta:
@@ -873,29 +1304,24 @@ class SistemaIA:
             Args:
                 pergunta (str): A pergunta original do usuário que não obteve resultado.
             """
-            self.tts.falar("Não encontrei uma resposta específica para sua pergunta.")
-            time.sleep(0.5)  # Pequena pausa para a fala não ficar corrida.
-
             # Busca por duas sugestões para oferecer alternativas ao usuário.
             sugestoes = self.motor_busca.obter_sugestoes_perguntas(self.ui.tema_atual, quantidade=2)
             
+            frases = ["Não encontrei uma resposta específica para sua pergunta."]
             if sugestoes:
-                self.tts.falar("Aqui estão algumas sugestões de perguntas que você pode fazer:")
-                time.sleep(0.5)
-                
                 # Atualiza a interface de texto para mostrar as sugestões visualmente.
                 self.ui.mostrar_sugestoes(sugestoes)
                 
                 # Vocaliza cada uma das sugestões para o usuário.
+                frases.append("Aqui estão algumas sugestões de perguntas que você pode fazer:")
                 for i, sugestao in enumerate(sugestoes, 1):
-                    self.tts.falar(f"Sugestão {i}, do tema {sugestao['tema']}, subtema {sugestao['subtema']}:")
-                    self.tts.falar(sugestao['pergunta'])
-                    if i < len(sugestoes):
-                        time.sleep(0.5) # Pausa entre as sugestões.
-                
-                self.tts.falar("Essas são sugestões de perguntas relacionadas.")
+                    frases.append(f"Sugestão {i}, do tema {sugestao['tema']}, subtema {sugestao['subtema']}:")
+                    frases.append(sugestao['pergunta'])
+                frases.append("Essas são sugestões de perguntas relacionadas.")
             else:
-                self.tts.falar("Não tenho sugestões no momento.")
+                frases.append("Não tenho sugestões no momento.")
+            
+            self.tts.falar_multi(frases)
 
 
     def _oferecer_resposta_encontrada(self, resposta, item_encontrado, pontuacao, pergunta_original):
@@ -905,19 +1331,21 @@ class SistemaIA:
         
         # ✅ FALA A QUALIDADE DA CORRESPONDÊNCIA
         if pontuacao >= 5:
-            self.tts.falar("Encontrei uma correspondência excelente")
+            qualidade = "Encontrei uma correspondência excelente"
         elif pontuacao >= 3:
-            self.tts.falar("Encontrei uma boa correspondência")  
+            qualidade = "Encontrei uma boa correspondência"
         elif pontuacao >= 1:
-            self.tts.falar("Encontrei uma correspondência mínima")
+            qualidade = "Encontrei uma correspondência mínima"
         else:
-            self.tts.falar("Encontrei uma correspondência")
+            qualidade = "Encontrei uma correspondência"
         
         # ✅ FALA A PERGUNTA EXATA DO JSON PARA CONFIRMAR
-        self.tts.falar("A pergunta relacionada é:")
-        self.tts.falar(pergunta_relacionada)
-        
-        self.tts.falar("Esta é a resposta que você quer ouvir?")
+        self.tts.falar_multi([
+            qualidade,
+            "A pergunta relacionada é:",
+            pergunta_relacionada,
+            "Esta é a resposta que você quer ouvir?",
+        ])
         print("ENTER para ouvir, 3 para cancelar")
         
         if self._aguardar_confirmacao():
@@ -926,27 +1354,46 @@ class SistemaIA:
             self.tts.falar("Resposta não reproduzida")
 
     def _aguardar_confirmacao(self, timeout=8):
-        """Aguarda confirmação do usuário"""
-        import keyboard
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if keyboard.is_pressed('enter'):
-                print("✅ Confirmado")
-                time.sleep(0.2)
-                return True
-            elif keyboard.is_pressed('3'):
-                print("❌ Cancelado")
-                time.sleep(0.2)
+        """Aguarda confirmação do usuário (ENTER confirma, 3 cancela)"""
+        # Módulo carregado uma vez pelo controlador (None se 'keyboard' não está instalado)
+        keyboard = self.controlador.keyboard
+        if not keyboard:
+            return False
+        
+        # O prazo só começa a contar depois que a pergunta terminou de ser falada
+        self.tts.aguardar()
+        
+        # Em vez de consultar o teclado a cada 100 ms, espera o próprio evento da
+        # tecla: a confirmação é atendida assim que ENTER ou 3 é pressionado.
+        tecla_pressionada = threading.Event()
+        confirmou = []
+        
+        def ao_pressionar(evento):
+            if not tecla_pressionada.is_set():
+                confirmou.append(evento.name == 'enter')
+                tecla_pressionada.set()
+        
+        ganchos = [
+            keyboard.on_press_key('enter', ao_pressionar),
+            keyboard.on_press_key('3', ao_pressionar),
+        ]
+        try:
+            if not tecla_pressionada.wait(timeout):
+                print("⏰ Tempo esgotado")
                 return False
-            time.sleep(0.1)
+        finally:
+            for gancho in ganchos:
+                keyboard.unhook(gancho)
         
-        print("⏰ Tempo esgotado")
+        if confirmou[0]:
+            print("✅ Confirmado")
+            return True
+        print("❌ Cancelado")
         return False
 
     def botao_repetir_audio(self):
         """✅ ALTERADO: Agora abre o submenu de repetir áudio"""
-        if self.ui.estado != "submenu_repetir":
+        if self.ui.estado != EstadoUI.SUBMENU_REPETIR:
             self.ui.entrar_submenu_repetir()
             self.tts.falar("Submenu repetir áudio. Use W e S para navegar")
 
@@ -964,7 +1411,15 @@ class SistemaIA:
         if self.ultimo_audio:
             self.tts.falar("Repetindo áudio gravado")
             try:
-                texto = self.reconhecedor.recognize_google(self.ultimo_audio, language='pt-BR')
+                # A transcrição feita em escutar() é reaproveitada; a API só é
+                # chamada de novo se aquele reconhecimento não deu certo.
+                texto = self.ultimo_audio_texto
+                if texto is None:
+                    texto = self._reconhecer(self.ultimo_audio)
+                    if texto is None:
+                        self.tts.falar("Reconhecimento cancelado")
+                        return
+                    self.ultimo_audio_texto = texto
                 self.tts.falar(f"Ouvi: {texto}")
             except Exception as e:
                 print(f"❌ Erro ao repetir áudio: {e}")
@@ -982,94 +1437,76 @@ class SistemaIA:
 
     # CONTROLES DE NAVEGAÇÃO VERTICAL
     def botao_cima(self):
-        if not self.tts.pode_processar_tecla():
-            return
-            
-        if self.ui.estado == "escolhendo_tema":
+        if self.ui.estado == EstadoUI.ESCOLHENDO_TEMA:
             if self.ui.temas_lista:
                 self.ui.tema_selecionado_idx = (self.ui.tema_selecionado_idx - 1) % len(self.ui.temas_lista)
                 self.ui.mostrar_temas()
-                self.tts.falar(self.ui.temas_lista[self.ui.tema_selecionado_idx])
+                self.tts.falar_interruptivel(self.ui.temas_lista[self.ui.tema_selecionado_idx])
                 
-        elif self.ui.estado == "escolhendo_subtema":
+        elif self.ui.estado == EstadoUI.ESCOLHENDO_SUBTEMA:
             subtemas = self.motor_busca.estrutura_temas.get(self.ui.tema_atual, [])
             if subtemas:
                 self.ui.subtema_selecionado_idx = (self.ui.subtema_selecionado_idx - 1) % len(subtemas)
                 self.ui.mostrar_subtemas()
-                self.tts.falar(subtemas[self.ui.subtema_selecionado_idx])
+                self.tts.falar_interruptivel(subtemas[self.ui.subtema_selecionado_idx])
 
     def botao_baixo(self):
-        if not self.tts.pode_processar_tecla():
-            return
-            
-        if self.ui.estado == "escolhendo_tema":
+        if self.ui.estado == EstadoUI.ESCOLHENDO_TEMA:
             if self.ui.temas_lista:
                 self.ui.tema_selecionado_idx = (self.ui.tema_selecionado_idx + 1) % len(self.ui.temas_lista)
                 self.ui.mostrar_temas()
-                self.tts.falar(self.ui.temas_lista[self.ui.tema_selecionado_idx])
+                self.tts.falar_interruptivel(self.ui.temas_lista[self.ui.tema_selecionado_idx])
                 
-        elif self.ui.estado == "escolhendo_subtema":
+        elif self.ui.estado == EstadoUI.ESCOLHENDO_SUBTEMA:
             subtemas = self.motor_busca.estrutura_temas.get(self.ui.tema_atual, [])
             if subtemas:
                 self.ui.subtema_selecionado_idx = (self.ui.subtema_selecionado_idx + 1) % len(subtemas)
                 self.ui.mostrar_subtemas()
-                self.tts.falar(subtemas[self.ui.subtema_selecionado_idx])
+                self.tts.falar_interruptivel(subtemas[self.ui.subtema_selecionado_idx])
 
     def botao_selecionar(self):
         if not self.tts.pode_processar_tecla():
             return
             
-        if self.ui.estado == "menu_principal":
-            self.ui.estado = "escolhendo_tema"
+        if self.ui.estado == EstadoUI.MENU_PRINCIPAL:
+            self.ui.estado = EstadoUI.ESCOLHENDO_TEMA
             self.ui.mostrar_temas()
             self.tts.falar("Escolha um tema")
             
-        elif self.ui.estado == "escolhendo_tema":
+        elif self.ui.estado == EstadoUI.ESCOLHENDO_TEMA:
             self.ui.tema_atual = self.ui.temas_lista[self.ui.tema_selecionado_idx]
-            self.ui.estado = "escolhendo_subtema"
+            self.ui.estado = EstadoUI.ESCOLHENDO_SUBTEMA
             self.ui.mostrar_subtemas()
             self.tts.falar(f"Tema {self.ui.tema_atual}")
             
-        elif self.ui.estado == "escolhendo_subtema":
+        elif self.ui.estado == EstadoUI.ESCOLHENDO_SUBTEMA:
             subtemas = self.motor_busca.estrutura_temas.get(self.ui.tema_atual, [])
             if subtemas:
                 self.ui.subtema_atual = subtemas[self.ui.subtema_selecionado_idx]
-                self.ui.estado = "modo_perguntas"
+                self.ui.estado = EstadoUI.MODO_PERGUNTAS
                 self.iniciar_modo_perguntas()
                 
-        elif self.ui.estado == "modo_perguntas":
+        elif self.ui.estado == EstadoUI.MODO_PERGUNTAS:
             self.botao_microfone()
 
     def botao_voltar(self):
         if not self.tts.pode_processar_tecla():
             return
             
-        if self.ui.estado == "escolhendo_tema":
-            self.ui.estado = "menu_principal"
-            self.ui.mostrar_menu_principal()
-            self.tts.falar("Menu principal")
-        elif self.ui.estado == "escolhendo_subtema":
-            self.ui.estado = "escolhendo_tema"
-            self.ui.mostrar_temas()
-            self.tts.falar("Escolhendo tema")
-        elif self.ui.estado == "modo_perguntas":
-            self.ui.estado = "escolhendo_subtema"
-            self.ui.mostrar_subtemas()
-            self.tts.falar("Escolhendo subtema")
+        transicao = self._VOLTAR.get(self.ui.estado)
+        if transicao:
+            self.ui.estado, anuncio = transicao
+            self.ui.mostrar_estado_atual()
+            self.tts.falar(anuncio)
 
     # MODO ALEATÓRIO FUNCIONANDO
     def botao_aleatorio(self):
         if not self.tts.pode_processar_tecla():
             return
             
-        if self.ui.estado == "menu_principal":
-            self.aleatorio_global()
-        elif self.ui.estado == "escolhendo_tema":
-            self.aleatorio_tema()
-        elif self.ui.estado == "escolhendo_subtema":
-            self.aleatorio_subtema_na_lista()
-        elif self.ui.estado == "modo_perguntas":
-            self.aleatorio_subtema()
+        aleatorio = self._aleatorio_por_estado.get(self.ui.estado)
+        if aleatorio:
+            aleatorio()
 
     def aleatorio_global(self):
         """Modo aleatório global"""
@@ -1106,27 +1543,28 @@ class SistemaIA:
             
         subtemas = self.motor_busca.estrutura_temas.get(self.ui.tema_atual, [])
         if subtemas:
-            self.ui.subtema_selecionado_idx = random.randint(0, len(subtemas) - 1)
+            self.ui.subtema_selecionado_idx = self._rng.randint(0, len(subtemas) - 1)
             self.ui.mostrar_subtemas()
-            self.tts.falar(f"Subtema: {subtemas[self.ui.subtema_selecionado_idx]}")
+            self.tts.falar_interruptivel(f"Subtema: {subtemas[self.ui.subtema_selecionado_idx]}")
 
     def aleatorio_subtema(self):
         if not self.dados_atuais: 
             return
             
         self.tts.falar("Pergunta aleatória deste subtema")
-        item = random.choice(self.dados_atuais)
+        item = self._rng.choice(self.dados_atuais)
         # ✅ NOVO: Guarda a resposta
         self.ultima_resposta = item['resposta']
         self._falar_pergunta_resposta(item, self.ui.tema_atual, self.ui.subtema_atual)
 
     def _falar_pergunta_resposta(self, item, tema, subtema):
         """Fala pergunta e resposta com confirmação"""
-        self.tts.falar("Pergunta aleatória")
-        self.tts.falar(f"De {tema}, {subtema}")
-        self.tts.falar(item['pergunta'])
-        
-        self.tts.falar("Quer ouvir a resposta?")
+        self.tts.falar_multi([
+            "Pergunta aleatória",
+            f"De {tema}, {subtema}",
+            item['pergunta'],
+            "Quer ouvir a resposta?",
+        ])
         print("ENTER para ouvir, 3 para pular")
         
         if self._aguardar_confirmacao():
@@ -1134,6 +1572,8 @@ class SistemaIA:
         else:
             self.tts.falar("Resposta pulada")
         
+        # As mensagens da confirmação ficaram na tela: redesenha mesmo sem mudança de estado
+        self.ui.invalidar_quadro()
         self.ui.mostrar_modo_perguntas()
 
     def iniciar_modo_perguntas(self):
@@ -1151,19 +1591,19 @@ class SistemaIA:
     def mostrar_instrucoes_completas(self):
         """✅ ATUALIZADO: Com apresentação Starlight"""
         if Config.PRIMEIRA_EXECUCAO:
-            self.tts.falar("Bem vindo! Sou seu Assistente Educacional, Starlight!")
-            time.sleep(0.5)
-            self.tts.falar("Use W e S para navegar")
-            self.tts.falar("ENTER para selecionar")
-            self.tts.falar("Tecla 4 para modo aleatório")
-            self.tts.falar("Tecla 3 para voltar")
-            self.tts.falar("Tecla R para acessar o menu de repetir áudio")
-            time.sleep(0.5)
-            self.tts.falar("Atenção importante sobre o sistema de busca:")
-            self.tts.falar("Quando você fizer uma pergunta, o sistema buscará a resposta mais relacionada")
-            self.tts.falar("A correspondência pode ser excelente, boa, mínima ou apenas relacionada")
-            self.tts.falar("Sempre confirmarei a pergunta exata encontrada antes de dar a resposta")
-            self.tts.falar("Assim você tem certeza de que é isso que quer ouvir")
+            self.tts.falar_multi([
+                "Bem vindo! Sou seu Assistente Educacional, Starlight!",
+                "Use W e S para navegar",
+                "ENTER para selecionar",
+                "Tecla 4 para modo aleatório",
+                "Tecla 3 para voltar",
+                "Tecla R para acessar o menu de repetir áudio",
+                "Atenção importante sobre o sistema de busca:",
+                "Quando você fizer uma pergunta, o sistema buscará a resposta mais relacionada",
+                "A correspondência pode ser excelente, boa, mínima ou apenas relacionada",
+                "Sempre confirmarei a pergunta exata encontrada antes de dar a resposta",
+                "Assim você tem certeza de que é isso que quer ouvir",
+            ])
             Config.PRIMEIRA_EXECUCAO = False
 
     def executar(self):
@@ -1171,16 +1611,19 @@ class SistemaIA:
         self.ui.mostrar_menu_principal()
         
         try:
-            while self.executando:
-                time.sleep(0.1)
+            # A thread principal só espera o sinal de encerramento; o timeout
+            # mantém o Ctrl+C atendido no Windows, onde wait() sem prazo não é interrompido.
+            while not self._parar.wait(1):
+                pass
         except KeyboardInterrupt:
             self.sair()
 
     def sair(self):
         print("\n👋 Saindo...")
-        self.tts.falar("Até logo! Starlight encerrando")
-        self.executando = False
-        exit()
+        # Descarta o que ainda estava para ser falado: só a despedida é esperada
+        self.tts.falar_interruptivel("Até logo! Starlight encerrando")
+        self.tts.aguardar()
+        self._parar.set()
 
 # =========================
 # EXECUÇÃO
@@ -1191,7 +1634,6 @@ if __name__ == "__main__":
     
     try:
         ia = SistemaIA()
-        ia.executando = True
         ia.executar()
     except KeyboardInterrupt:
         print("\n👋 Sistema encerrado")